@@ -0,0 +1,181 @@
+import ast
+import json
+import math
+import mmap
+import struct
+
+# 批量结果的列式二进制格式
+# 文件是标准的 NumPy .npy（1.0版）结构化数组，写入只依赖标准库；
+# 下游可以直接 np.load(path, mmap_mode="r") 映射，按列取 arr["cx"] 无需解析
+
+NPY_MAGIC = b"\x93NUMPY\x01\x00"
+HEADER_ALIGN = 64
+
+
+def _schema(room_width, name_width):
+    # 列定义：(字段名, numpy类型描述, struct格式)
+    return [
+        ("room", f"|S{room_width}", f"{room_width}s"),
+        ("name", f"|S{name_width}", f"{name_width}s"),
+        ("cx", "<f8", "d"),
+        ("cy", "<f8", "d"),
+        ("angle", "<i2", "h"),
+        ("on_wall", "|b1", "?"),
+        ("placed", "|b1", "?"),
+    ]
+
+
+def _record_struct(schema):
+    # '<' 表示小端且无对齐填充，与 numpy 的紧凑结构化类型一致
+    return struct.Struct("<" + "".join(fmt for _, _, fmt in schema))
+
+
+def _iter_results(results):
+    if isinstance(results, dict):
+        return list(results.items())
+    return list(results)
+
+
+def is_floor_plan(results):
+    # floor_plan.solve_floor_plan() 的输出：{"feasible", "rooms", "unplaced"}
+    return isinstance(results, dict) and isinstance(results.get("rooms"), dict) and \
+        isinstance(results.get("unplaced"), list)
+
+
+def results_to_rows(results):
+    # 将 {room_id: get_result()} 或多房间平面图的结果展开为逐物品的行
+    # 每个房间先写一行标记行（物品名称为空），没有任何物品的房间也能还原；
+    # 房间id为空的行属于整个平面图：标记行表示多房间格式，其余为无处可放的物品
+    rows = []
+    if is_floor_plan(results):
+        rows.append((b"", b"", math.nan, math.nan, 0, False, False))
+        for item_name in results["unplaced"]:
+            rows.append((b"", item_name.encode("utf-8"), math.nan, math.nan, 0, False, False))
+        results = results["rooms"]
+
+    for room_id, result in _iter_results(results):
+        room = str(room_id).encode("utf-8")
+        if not room:
+            raise ValueError("Room id must not be empty")
+
+        rows.append((room, b"", math.nan, math.nan, 0, False, False))
+        for placement in result["placements"]:
+            x, y = placement["center"]
+            rows.append((room, placement["name"].encode("utf-8"), float(x), float(y),
+                         int(placement["angle"]), bool(placement["onWall"]), True))
+        # 未放置的物品也占一行，坐标记为NaN，便于还原feasible
+        for item_name in result.get("unplaced", []):
+            rows.append((room, item_name.encode("utf-8"), math.nan, math.nan, 0, False, False))
+    return rows
+
+
+def write_results(path, results):
+    rows = results_to_rows(results)
+    room_width = max([len(row[0]) for row in rows] + [1])
+    name_width = max([len(row[1]) for row in rows] + [1])
+    schema = _schema(room_width, name_width)
+    record = _record_struct(schema)
+
+    descr = [(field, dtype) for field, dtype, _ in schema]
+    header = repr({"descr": descr, "fortran_order": False, "shape": (len(rows),)})
+    # 头部补齐到64字节边界，保证数据区可以直接映射
+    padding = -(len(NPY_MAGIC) + 2 + len(header) + 1) % HEADER_ALIGN
+    header = (header + " " * padding + "\n").encode("latin1")
+
+    with open(path, "wb") as f:
+        f.write(NPY_MAGIC)
+        f.write(struct.pack("<H", len(header)))
+        f.write(header)
+        for row in rows:
+            f.write(record.pack(*row))
+
+    return len(rows)
+
+
+def read_columns(path):
+    # 不依赖numpy的读取方式：映射文件后按记录解包为列
+    with open(path, "rb") as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[:len(NPY_MAGIC)] != NPY_MAGIC:
+                raise ValueError(f"{path} is not a version 1.0 .npy file")
+
+            header_start = len(NPY_MAGIC) + 2
+            (header_len,) = struct.unpack_from("<H", data, len(NPY_MAGIC))
+            header = ast.literal_eval(data[header_start:header_start + header_len].decode("latin1"))
+
+            fields = [field for field, _ in header["descr"]]
+            formats = []
+            for field, dtype in header["descr"]:
+                if dtype.startswith("|S"):
+                    formats.append(dtype[2:] + "s")
+                else:
+                    formats.append({"<f8": "d", "<i2": "h", "|b1": "?"}[dtype])
+            record = struct.Struct("<" + "".join(formats))
+
+            (count,) = header["shape"]
+            offset = header_start + header_len
+            rows = list(record.iter_unpack(data[offset:offset + count * record.size]))
+
+    columns = {}
+    for index, field in enumerate(fields):
+        values = [row[index] for row in rows]
+        if isinstance(values[0] if values else None, bytes):
+            values = [value.rstrip(b"\0").decode("utf-8") for value in values]
+        columns[field] = values
+
+    return columns
+
+
+def columns_to_results(columns):
+    # 将列还原为与get_result()相同结构的字典；含平面图标记行时还原为多房间格式
+    results = {}
+    floor_plan = None
+    for i in range(len(columns["room"])):
+        room_id = columns["room"][i]
+        name = columns["name"][i]
+
+        if not room_id:
+            if floor_plan is None:
+                floor_plan = {"feasible": True, "rooms": results, "unplaced": []}
+            if name:
+                floor_plan["unplaced"].append(name)
+                floor_plan["feasible"] = False
+            continue
+
+        result = results.setdefault(room_id, {
+            "feasible": True,
+            "placements": [],
+            "unplaced": []
+        })
+
+        if columns["placed"][i]:
+            result["placements"].append({
+                "name": name,
+                "center": (columns["cx"][i], columns["cy"][i]),
+                "angle": int(columns["angle"][i]),
+                "onWall": bool(columns["on_wall"][i])
+            })
+        elif name:
+            result["unplaced"].append(name)
+            result["feasible"] = False
+
+    return floor_plan if floor_plan is not None else results
+
+
+def read_results(path):
+    return columns_to_results(read_columns(path))
+
+
+if __name__ == "__main__":
+    # JSON（{房间id: 结果} 或多房间平面图的结果）与二进制格式互相转换：
+    #   python columnar_io.py results.json results.npy
+    #   python columnar_io.py results.npy results.json
+    import sys
+
+    src, dst = sys.argv[1], sys.argv[2]
+    if src.endswith(".npy"):
+        with open(dst, "w") as f:
+            json.dump(read_results(src), f, indent=2)
+    else:
+        with open(src, "r") as f:
+            write_results(dst, json.load(f))
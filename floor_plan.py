@@ -0,0 +1,173 @@
+import json
+import logging
+import math
+from concurrent.futures import ProcessPoolExecutor
+
+from rectangle_packer import DEFAULT_STRATEGY, RectanglePacker, compile_room, get_scale, scale_items
+
+logger = logging.getLogger(__name__)
+
+# 多房间平面图求解：多个房间共享同一份物品清单
+# 输入格式：
+#   {
+#       "rooms": [{"id": "A", "boundary": [...], "doors": [...], "obstacles": [...]}, ...],
+#       "algoToPlace": {"fridge": [1220, 1330], ...}
+#   }
+# 每个房间只编译一次；先按容量估计把物品分配到各房间，再用多进程并行摆放各房间，
+# 被房间拒绝的物品重新分配给其他房间，直到所有物品放下或没有房间可以再尝试
+
+def estimate_capacity(room):
+    # 粗略估计房间容量：可用面积和可贴墙的墙长
+    area = room.polygon.get_area()
+    for box, zone, kind in room.keep_out.zones:
+        area -= zone.get_area()
+
+    wall_length = 0
+    for p1, p2 in room.wall_edges:
+        # 只有水平或垂直的墙可以与矩形贴合
+        if room.is_zero(p1.x - p2.x) or room.is_zero(p1.y - p2.y):
+            wall_length += math.hypot(p2.x - p1.x, p2.y - p1.y)
+
+    return [area, wall_length]
+
+def can_fit(room, dimensions):
+    # 物品只能以0或90度放置：短边和长边分别不能超过房间包围盒的短边和长边
+    # 有一边为0的物品无法估计容量，视为无处可放
+    if min(dimensions) <= 0:
+        return False
+    min_x, min_y, max_x, max_y = room.bounds
+    return all(d <= s for d, s in zip(sorted(dimensions), sorted((max_x - min_x, max_y - min_y))))
+
+def assign_items(items, rooms, capacities, rejected):
+    # 按面积从大到小，把每个物品分配给估计剩余容量最充足的房间
+    # 已经拒绝过该物品的房间不再考虑；返回 {房间id: {物品名称: 尺寸}} 和无处可放的物品
+    assignment = {}
+    unassigned = []
+
+    for item_name, dimensions in sorted(items.items(), key=lambda x: x[1][0] * x[1][1], reverse=True):
+        item_area = dimensions[0] * dimensions[1]
+        item_wall = max(dimensions)
+
+        best_room = None
+        best_score = None
+        for room_id, room in rooms.items():
+            if room_id in rejected.get(item_name, ()) or not can_fit(room, dimensions):
+                continue
+            area, wall_length = capacities[room_id]
+            score = min(area / item_area, wall_length / item_wall)
+            if best_score is None or score > best_score:
+                best_room = room_id
+                best_score = score
+
+        if best_room is None:
+            unassigned.append(item_name)
+            continue
+
+        assignment.setdefault(best_room, {})[item_name] = dimensions
+        capacities[best_room][0] -= item_area
+        capacities[best_room][1] -= item_wall
+
+    return assignment, unassigned
+
+_worker_rooms = {}
+
+def _init_worker(rooms):
+    # 每个工作进程只接收一次编译好的房间几何
+    _worker_rooms.update(rooms)
+
+def _pack_room(room_id, items, placed, strategy):
+    # 在工作进程中摆放一个房间：先恢复已接受的物品，再放置新分配的物品
+    packer = RectanglePacker(_worker_rooms[room_id], items, strategy)
+    for item_name, rect, on_wall in placed:
+        packer.place(item_name, rect, on_wall)
+    packer.pack_rectangles()
+
+    return [(item_name, rect, item_name in packer.wall_items) for item_name, rect in packer.item_map.items()]
+
+def solve_floor_plan(input_data, strategy=DEFAULT_STRATEGY, max_workers=None, precision=None):
+    # precision不为None时所有房间和物品都使用整数定点模式
+    items = scale_items(input_data["algoToPlace"], get_scale(precision))
+    rooms = {}
+    for i, room_data in enumerate(input_data["rooms"]):
+        # 没有id的房间以序号为id，不能与其他房间的id重复
+        room_id = str(room_data.get("id", i))
+        if room_id in rooms:
+            raise ValueError(f"Duplicate room id: {room_id}")
+        rooms[room_id] = compile_room(room_data, precision)
+
+    capacities = {room_id: estimate_capacity(room) for room_id, room in rooms.items()}
+    accepted = {room_id: {} for room_id in rooms}  # 房间id -> 已接受物品的尺寸
+    placed = {room_id: [] for room_id in rooms}  # 房间id -> [(物品名称, 矩形, 是否贴墙)]
+    rejected = {}  # 物品名称 -> 拒绝过它的房间id
+    unplaced = []
+    pending = dict(items)
+
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(rooms,)) as executor:
+        while pending:
+            assignment, unassigned = assign_items(pending, rooms, capacities, rejected)
+            unplaced.extend(unassigned)
+            if not assignment:
+                break
+
+            futures = {
+                room_id: executor.submit(_pack_room, room_id, dict(accepted[room_id], **new_items),
+                                         placed[room_id], strategy)
+                for room_id, new_items in assignment.items()
+            }
+
+            pending = {}
+            for room_id, future in futures.items():
+                placed[room_id] = future.result()
+                placed_names = set(item_name for item_name, rect, on_wall in placed[room_id])
+
+                for item_name, dimensions in assignment[room_id].items():
+                    if item_name in placed_names:
+                        accepted[room_id][item_name] = dimensions
+                    else:
+                        # 房间拒绝的物品退回容量并重新分配
+                        logger.info("Room %s rejected item %s", room_id, item_name)
+                        rejected.setdefault(item_name, set()).add(room_id)
+                        capacities[room_id][0] += dimensions[0] * dimensions[1]
+                        capacities[room_id][1] += max(dimensions)
+                        pending[item_name] = dimensions
+
+    for item_name in unplaced:
+        logger.warning("Could not place item %s in any room", item_name)
+
+    results = {}
+    for room_id, room in rooms.items():
+        packer = RectanglePacker(room, accepted[room_id], strategy)
+        for item_name, rect, on_wall in placed[room_id]:
+            packer.place(item_name, rect, on_wall)
+        results[room_id] = packer.get_result()
+
+    return {
+        "feasible": not unplaced,
+        "rooms": results,
+        "unplaced": [item_name for item_name in items if item_name in unplaced]
+    }
+
+if __name__ == "__main__":
+    # 用法：python floor_plan.py plan.json [results.npy]
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("input")
+    parser.add_argument("output", nargs="?")
+    parser.add_argument("--strategy", default=DEFAULT_STRATEGY)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--precision", type=int, default=None)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+
+    with open(args.input, "r") as f:
+        input_data = json.load(f)
+
+    result = solve_floor_plan(input_data, args.strategy, args.workers, args.precision)
+    print(json.dumps(result, indent=2))
+
+    if args.output:
+        from columnar_io import write_results
+        count = write_results(args.output, result)
+        print(f"Wrote {count} rows to {args.output}")
@@ -1,5 +1,52 @@
 import json
+import logging
 import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from fractions import Fraction
+
+logger = logging.getLogger(__name__)
+
+def half(value, exact=False):
+    # 浮点模式保持原有的除法
+    # 定点模式（exact）下坐标和尺寸都是偶数，折半后仍是整数；奇数折半用分数保持精确
+    if not exact:
+        return value / 2
+    if isinstance(value, int) and value % 2 == 0:
+        return value // 2
+    return Fraction(value) / 2
+
+def get_scale(precision):
+    # 定点模式的缩放倍数：保留precision位小数，再乘2使中点和半边长都是整数
+    if precision is None:
+        return None
+    return 2 * 10 ** precision
+
+def to_fixed(value, scale):
+    # 先按10 ** precision取整再乘2，保证结果是偶数
+    return 2 * int(round(value * (scale // 2)))
+
+def scale_points(points, scale):
+    return [[to_fixed(x, scale), to_fixed(y, scale)] for x, y in points]
+
+def scale_items(items, scale):
+    if scale is None:
+        return items
+    return {name: [to_fixed(v, scale) for v in dimensions] for name, dimensions in items.items()}
+
+def scale_input(input_data, scale):
+    # 在加载时把所有输入坐标和尺寸一次性换算为整数
+    data = dict(input_data)
+    data["boundary"] = scale_points(input_data["boundary"], scale)
+    if input_data.get("door"):
+        data["door"] = scale_points(input_data["door"], scale)
+    if "doors" in input_data:
+        data["doors"] = [dict(door, points=scale_points(door["points"], scale)) for door in input_data["doors"]]
+    if "obstacles" in input_data:
+        data["obstacles"] = [scale_points(points, scale) for points in input_data["obstacles"]]
+    if "algoToPlace" in input_data:
+        data["algoToPlace"] = scale_items(input_data["algoToPlace"], scale)
+    return data
 
 class Point:
     def __init__(self, x, y):
@@ -7,7 +54,7 @@ class Point:
         self.y = y
 
 class Rectangle:
-    def __init__(self, center, length, width, angle=0):
+    def __init__(self, center, length, width, angle=0, exact=False):
         self.center = center
         self.length = length
         self.width = width
@@ -15,17 +62,18 @@ class Rectangle:
         self.is_rotated = angle == 90
         self.original_length = length
         self.original_width = width
+        self.exact = exact  # 定点模式下顶点坐标保持精确
         
         # 计算矩形的四个顶点
         self.update_vertices()
     
     def update_vertices(self):
         if self.is_rotated:
-            half_w = self.original_length / 2
-            half_h = self.original_width / 2
+            half_w = half(self.original_length, self.exact)
+            half_h = half(self.original_width, self.exact)
         else:
-            half_w = self.original_width / 2
-            half_h = self.original_length / 2
+            half_w = half(self.original_width, self.exact)
+            half_h = half(self.original_length, self.exact)
             
         x = self.center.x
         y = self.center.y
@@ -42,14 +90,23 @@ class Rectangle:
         self.angle = 90 if self.is_rotated else 0
         self.update_vertices()
     
+    def get_bounds(self):
+        min_x = min(v.x for v in self.vertices)
+        max_x = max(v.x for v in self.vertices)
+        min_y = min(v.y for v in self.vertices)
+        max_y = max(v.y for v in self.vertices)
+        return (min_x, min_y, max_x, max_y)
+    
     def get_dimensions(self):
         if self.is_rotated:
             return (self.original_length, self.original_width)
         return (self.original_width, self.original_length)
 
 class Polygon:
-    def __init__(self, points):
+    def __init__(self, points, exact=False):
         self.points = [Point(x, y) for x, y in points]
+        # 定点模式下顶点全为整数，使用精确的整数运算，不需要容差
+        self.is_exact = exact
     
     def is_point_inside(self, point):
         # 使用射线法判断点是否在多边形内
@@ -59,13 +116,56 @@ class Polygon:
         for i in range(n):
             j = (i + 1) % n
             
-            if ((self.points[i].y > point.y) != (self.points[j].y > point.y)) and \
+            if self.is_exact:
+                # 交点比较改为交叉相乘，避免除法
+                a = self.points[i]
+                b = self.points[j]
+                if (a.y > point.y) != (b.y > point.y):
+                    lhs = (point.x - a.x) * (b.y - a.y)
+                    rhs = (b.x - a.x) * (point.y - a.y)
+                    if (lhs < rhs) if b.y > a.y else (lhs > rhs):
+                        inside = not inside
+            elif ((self.points[i].y > point.y) != (self.points[j].y > point.y)) and \
                (point.x < (self.points[j].x - self.points[i].x) * (point.y - self.points[i].y) / \
                 (self.points[j].y - self.points[i].y) + self.points[i].x):
                 inside = not inside
                 
         return inside
     
+    def is_point_on_edge(self, point):
+        # 判断点是否落在多边形的某条边上
+        n = len(self.points)
+        
+        for i in range(n):
+            a = self.points[i]
+            b = self.points[(i + 1) % n]
+            
+            if self.is_exact:
+                if min(a.x, b.x) <= point.x <= max(a.x, b.x) and \
+                   min(a.y, b.y) <= point.y <= max(a.y, b.y) and \
+                   (b.x - a.x) * (point.y - a.y) == (b.y - a.y) * (point.x - a.x):
+                    return True
+            elif min(a.x, b.x) - 1e-6 <= point.x <= max(a.x, b.x) + 1e-6 and \
+               min(a.y, b.y) - 1e-6 <= point.y <= max(a.y, b.y) + 1e-6:
+                cross = (b.x - a.x) * (point.y - a.y) - (b.y - a.y) * (point.x - a.x)
+                if abs(cross) <= 1e-6 * max(math.hypot(b.x - a.x, b.y - a.y), 1):
+                    return True
+        
+        return False
+    
+    def contains_point(self, point):
+        # 边界上的点也算在多边形内，用于紧贴墙面的矩形
+        return self.is_point_on_edge(point) or self.is_point_inside(point)
+    
+    def get_area(self):
+        # 鞋带公式计算面积
+        n = len(self.points)
+        area = 0
+        for i in range(n):
+            j = (i + 1) % n
+            area += self.points[i].x * self.points[j].y - self.points[j].x * self.points[i].y
+        return abs(area) / 2
+    
     def get_bounds(self):
         min_x = min(p.x for p in self.points)
         max_x = max(p.x for p in self.points)
@@ -84,104 +184,284 @@ class Door:
         
         self.is_open_inward = is_open_inward
         
-        # 计算门的宽度
-        if abs(self.points[0].x - self.points[1].x) < 1e-6:
-            # 垂直门
-            self.width = abs(self.points[0].y - self.points[1].y)
-        else:
-            # 水平门
-            self.width = abs(self.points[0].x - self.points[1].x)
+        # 计算门的宽度（门可以位于任意方向的墙上）
+        self.width = math.hypot(self.points[1].x - self.points[0].x, self.points[1].y - self.points[0].y)
     
     def get_obstruction_area(self, polygon):
-        # 如果是内开门，计算门打开时占据的区域
-        if not self.is_open_inward:
+        # 如果是内开门，计算门打开时占据的区域；宽度为0的门没有打开区域
+        if not self.is_open_inward or self.width == 0:
             return []
         
-        # 计算门的中心点和方向
-        center_x = (self.points[0].x + self.points[1].x) / 2
-        center_y = (self.points[0].y + self.points[1].y) / 2
-        
-        # 确定门的方向（水平或垂直）
-        is_vertical = abs(self.points[0].x - self.points[1].x) < 1e-6
-        
-        # 计算门打开时占据的N x N区域
-        N = self.width
-        
-        if is_vertical:
-            # 垂直门
-            test_point = Point(center_x + N/2, center_y)
-            if polygon.is_point_inside(test_point):
-                # 门向右开
-                return [
-                    Point(center_x, center_y - N/2),
-                    Point(center_x + N, center_y - N/2),
-                    Point(center_x + N, center_y + N/2),
-                    Point(center_x, center_y + N/2)
-                ]
-            else:
-                # 门向左开
-                return [
-                    Point(center_x - N, center_y - N/2),
-                    Point(center_x, center_y - N/2),
-                    Point(center_x, center_y + N/2),
-                    Point(center_x - N, center_y + N/2)
-                ]
+        # 法线取门方向向量(p1 - p0)旋转90度，长度恰好为门宽N，无需归一化，定点模式下仍是整数
+        p0, p1 = self.points
+        nx = p0.y - p1.y
+        ny = p1.x - p0.x
+        
+        # 用门中点沿法线偏移N/2的测试点确定房间内侧
+        exact = polygon.is_exact
+        center_x = half(p0.x + p1.x, exact)
+        center_y = half(p0.y + p1.y, exact)
+        if not polygon.is_point_inside(Point(center_x + half(nx, exact), center_y + half(ny, exact))):
+            nx, ny = -nx, -ny
+        
+        # 门打开时占据门内侧的N x N区域
+        return [
+            Point(p0.x, p0.y),
+            Point(p1.x, p1.y),
+            Point(p1.x + nx, p1.y + ny),
+            Point(p0.x + nx, p0.y + ny)
+        ]
+
+def parse_doors(input_data):
+    # 支持两种输入格式：
+    #   "doors": [{"points": [[x1, y1], [x2, y2]], "isOpenInward": true}, ...]
+    #   "door": [[x1, y1], [x2, y2]] 与 "isOpenInward"（单个门）
+    if "doors" in input_data:
+        return [Door(door["points"], door.get("isOpenInward", False)) for door in input_data["doors"]]
+    
+    if input_data.get("door"):
+        return [Door(input_data["door"], input_data.get("isOpenInward", False))]
+    
+    return []
+
+def segment_enters_box(p1, p2, box, exact=False):
+    # 判断线段是否进入矩形框内部（仅与边界接触不算），exact时用分数保持精确
+    min_x, min_y, max_x, max_y = box
+    t0, t1 = 0, 1
+    dx = p2.x - p1.x
+    dy = p2.y - p1.y
+    
+    # Liang-Barsky裁剪
+    for p, q in ((-dx, p1.x - min_x), (dx, max_x - p1.x), (-dy, p1.y - min_y), (dy, max_y - p1.y)):
+        if p == 0:
+            if q < 0:
+                return False
         else:
-            # 水平门
-            test_point = Point(center_x, center_y + N/2)
-            if polygon.is_point_inside(test_point):
-                # 门向上开
-                return [
-                    Point(center_x - N/2, center_y),
-                    Point(center_x + N/2, center_y),
-                    Point(center_x + N/2, center_y + N),
-                    Point(center_x - N/2, center_y + N)
-                ]
+            t = Fraction(q) / p if exact else q / p
+            if p < 0:
+                t0 = max(t0, t)
             else:
-                # 门向下开
-                return [
-                    Point(center_x - N/2, center_y - N),
-                    Point(center_x + N/2, center_y - N),
-                    Point(center_x + N/2, center_y),
-                    Point(center_x - N/2, center_y)
-                ]
+                t1 = min(t1, t)
+    
+    if t0 > t1:
+        return False
+    
+    # 裁剪后线段的中点严格在框内时，线段穿过了框的内部
+    t = half(t0 + t1, exact)
+    x = p1.x + dx * t
+    y = p1.y + dy * t
+    return min_x < x < max_x and min_y < y < max_y
 
-class RectanglePacker:
-    def __init__(self, boundary, door_points, items):
-        self.polygon = Polygon(boundary)
-        # 默认is_open_inward为False，后续将通过set_door_open_inward方法设置
-        self.door = Door(door_points, False)
-        self.items = items
-        self.placed_rectangles = []
+class UniformGrid:
+    # 均匀网格索引的公共部分：按包围盒把编号登记到覆盖的网格中，
+    # 查询时只检查所在网格内的编号，查询代价与登记总数无关
+    # exact为True时（定点模式）几何判断使用精确运算
+    def __init__(self, cell_size=1000, exact=False):
+        self.cell_size = cell_size
+        self.exact = exact
+        self.cells = {}  # 网格坐标 -> 编号列表
+    
+    def get_cells(self, box):
+        min_x, min_y, max_x, max_y = box
+        for i in range(int(min_x // self.cell_size), int(max_x // self.cell_size) + 1):
+            for j in range(int(min_y // self.cell_size), int(max_y // self.cell_size) + 1):
+                yield (i, j)
+    
+    def register(self, item_id, box):
+        for cell in self.get_cells(box):
+            self.cells.setdefault(cell, []).append(item_id)
+    
+    def candidates(self, box):
+        # 与矩形框所在网格相关的编号，每个编号只返回一次
+        checked = set()
+        for cell in self.get_cells(box):
+            for item_id in self.cells.get(cell, ()):
+                if item_id not in checked:
+                    checked.add(item_id)
+                    yield item_id
+
+class KeepOutIndex(UniformGrid):
+    # 禁止放置区域（内开门的打开区域、柱子等障碍物）的网格索引
+    def __init__(self, cell_size=1000, exact=False):
+        super().__init__(cell_size, exact)
+        self.zones = []  # (包围盒, 区域多边形, 区域类型)
     
-    def set_door_open_inward(self, is_open_inward):
-        self.door.is_open_inward = is_open_inward
+    def __len__(self):
+        return len(self.zones)
+    
+    def add(self, points, kind="door"):
+        zone = Polygon([(p.x, p.y) for p in points], self.exact)
+        box = zone.get_bounds()
+        self.register(len(self.zones), box)
+        self.zones.append((box, zone, kind))
+    
+    def overlaps(self, box):
+        # 判断矩形框是否与任一区域重叠（仅边界接触不算重叠）
+        min_x, min_y, max_x, max_y = box
+        
+        for zone_id in self.candidates(box):
+            (z_min_x, z_min_y, z_max_x, z_max_y), zone, kind = self.zones[zone_id]
+            if z_max_x <= min_x or z_min_x >= max_x or z_max_y <= min_y or z_min_y >= max_y:
+                continue
+            
+            # 区域的某条边穿过矩形内部
+            n = len(zone.points)
+            for k in range(n):
+                if segment_enters_box(zone.points[k], zone.points[(k + 1) % n], box, self.exact):
+                    return True
+            
+            # 没有边穿过时，矩形要么完全在区域内，要么与区域不相交
+            if zone.is_point_inside(Point(half(min_x + max_x, self.exact), half(min_y + max_y, self.exact))):
+                return True
+        
+        return False
+
+class EdgeIndex(UniformGrid):
+    # 轮廓边的网格索引，用于检查是否有墙穿过候选矩形的内部
+    def __init__(self, cell_size=1000, exact=False):
+        super().__init__(cell_size, exact)
+        self.edges = []
+    
+    def add(self, p1, p2):
+        box = (min(p1.x, p2.x), min(p1.y, p2.y), max(p1.x, p2.x), max(p1.y, p2.y))
+        self.register(len(self.edges), box)
+        self.edges.append((p1, p2))
+    
+    def enters(self, box):
+        # 判断是否有边进入矩形框内部（仅与边界接触不算）
+        for edge_id in self.candidates(box):
+            p1, p2 = self.edges[edge_id]
+            if segment_enters_box(p1, p2, box, self.exact):
+                return True
+        
+        return False
+
+def get_edges(polygon):
+    n = len(polygon.points)
+    return [(polygon.points[i], polygon.points[(i + 1) % n]) for i in range(n)]
+
+class Room:
+    # 编译后的房间几何：轮廓、墙边、门的阻碍区域和障碍物的索引
+    # 构建后不再修改，可以在多个并发求解之间共享
+    # scale不为None时为定点模式：所有坐标和尺寸已按scale换算为整数，只在输出时换算回浮点数
+    def __init__(self, boundary, doors, obstacles=(), scale=None):
+        self.scale = scale
+        self.is_exact = scale is not None
+        # 步长、测试偏移等常量的单位
+        self.unit = scale or 1
+        self.polygon = Polygon(boundary, self.is_exact)
+        self.doors = tuple(doors)
+        # 障碍物（柱子、地漏、固定设备等）是轮廓内的洞
+        self.obstacles = tuple(Polygon(points, self.is_exact) for points in obstacles)
         
         # 计算多边形的边界框
         self.bounds = self.polygon.get_bounds()
         
-        # 获取门的阻碍区域
-        self.door_obstruction = self.door.get_obstruction_area(self.polygon)
+        # 轮廓的边和障碍物的边都可以作为贴墙放置的墙
+        edges = get_edges(self.polygon)
+        self.edge_obstacles = {}  # 障碍物的边 -> 所属障碍物
+        for obstacle in self.obstacles:
+            for edge in get_edges(obstacle):
+                edges.append(edge)
+                self.edge_obstacles[edge] = obstacle
+        self.wall_edges = tuple(edges)
+        
+        # 轮廓边的索引：顶点落在墙上的矩形还需要确认没有墙穿过其内部
+        self.boundary_index = EdgeIndex(1000 * self.unit, self.is_exact)
+        for p1, p2 in get_edges(self.polygon):
+            self.boundary_index.add(p1, p2)
+        
+        # 每个门的阻碍区域只计算一次，与障碍物一起登记到共享的禁止区域索引中
+        self.keep_out = KeepOutIndex(1000 * self.unit, self.is_exact)
+        for door in self.doors:
+            obstruction = door.get_obstruction_area(self.polygon)
+            if obstruction:
+                self.keep_out.add(obstruction)
+        for obstacle in self.obstacles:
+            self.keep_out.add(obstacle.points, "obstacle")
+    
+    def is_room_side(self, edge, point):
+        # 判断墙边旁的测试点是否在房间一侧：
+        # 轮廓的边只看轮廓，障碍物的边取该障碍物之外的一侧，不受其他障碍物影响
+        obstacle = self.edge_obstacles.get(edge)
+        if obstacle is None:
+            return self.polygon.is_point_inside(point)
+        return not obstacle.is_point_inside(point)
+    
+    def is_zero(self, value):
+        # 定点模式下精确比较，浮点模式下使用容差
+        if self.scale:
+            return value == 0
+        return abs(value) < 1e-6
+    
+    def half(self, value):
+        return half(value, self.is_exact)
+    
+    def to_output(self, value):
+        if self.scale:
+            return float(value / self.scale)
+        return value
+
+def compile_room(input_data, precision=None):
+    # precision不为None时启用定点模式，坐标保留precision位小数
+    scale = get_scale(precision)
+    if scale is not None:
+        input_data = scale_input(input_data, scale)
+    return Room(input_data["boundary"], parse_doors(input_data), input_data.get("obstacles", ()), scale)
+
+class SolveCancelled(Exception):
+    # 竞速模式下，其他策略已经得到可行解时抛出
+    pass
+
+# 放置策略注册表：策略名 -> 放置单个物品的函数 func(packer, item_name, dimensions)
+# 函数成功放置物品时返回True
+PLACEMENT_STRATEGIES = {}
+# 默认策略保持第一版算法；第二版的默认策略见 rectangle_packer_v2.py
+DEFAULT_STRATEGY = "wall"
+
+def register_strategy(name):
+    def decorator(func):
+        PLACEMENT_STRATEGIES[name] = func
+        return func
+    return decorator
+
+class RectanglePacker:
+    # 单次求解的放置状态；房间几何来自共享的Room，求解过程中只读
+    def __init__(self, room, items, strategy=DEFAULT_STRATEGY, cancel_event=None, log=None):
+        if strategy not in PLACEMENT_STRATEGIES:
+            raise ValueError(f"Unknown placement strategy: {strategy}")
+        
+        self.room = room
+        self.items = items
+        self.strategy = strategy
+        self.cancel_event = cancel_event
+        self.log = log or logger
+        self.placed_rectangles = []
+        self.item_map = {}  # 存储物品名称和矩形的对应关系
+        self.wall_items = set()  # 记录贴墙放置的物品名称
     
-    def is_rectangle_valid(self, rectangle):
+    def is_rectangle_valid(self, rectangle, include_edges=False):
         # 检查矩形是否在多边形内且不与其他矩形重叠
+        # include_edges为True时，落在轮廓边上的顶点也算在多边形内
         
         # 检查矩形的所有顶点是否在多边形内
+        is_inside = self.room.polygon.contains_point if include_edges else self.room.polygon.is_point_inside
         for vertex in rectangle.vertices:
-            if not self.polygon.is_point_inside(vertex):
+            if not is_inside(vertex):
                 return False
         
+        # 只检查顶点不够：凹进来的墙可能从矩形中间穿过
+        if self.room.boundary_index.enters(rectangle.get_bounds()):
+            return False
+        
         # 检查矩形是否与其他已放置的矩形重叠
         for placed in self.placed_rectangles:
             if self.is_overlap(rectangle, placed):
                 return False
         
-        # 检查矩形是否与门的阻碍区域重叠
-        if self.door_obstruction:
-            door_poly = Polygon([(p.x, p.y) for p in self.door_obstruction])
-            for vertex in rectangle.vertices:
-                if door_poly.is_point_inside(vertex):
-                    return False
+        # 通过索引检查矩形是否与门的阻碍区域重叠
+        if self.room.keep_out and self.room.keep_out.overlaps(rectangle.get_bounds()):
+            return False
         
         return True
     
@@ -205,29 +485,31 @@ class RectanglePacker:
         return is_intersecting(r1_min_x, r1_max_x, r2_min_x, r2_max_x) and \
                is_intersecting(r1_min_y, r1_max_y, r2_min_y, r2_max_y)
     
+    def check_cancelled(self):
+        if self.cancel_event is not None and self.cancel_event.is_set():
+            raise SolveCancelled()
+    
     def get_wall_edges(self):
         # 获取多边形的所有边
-        edges = []
-        n = len(self.polygon.points)
-        
-        for i in range(n):
-            j = (i + 1) % n
-            p1 = self.polygon.points[i]
-            p2 = self.polygon.points[j]
-            edges.append((p1, p2))
-        
-        return edges
+        return self.room.wall_edges
     
-    def find_wall_positions(self, item_name, dimensions):
+    def make_rectangle(self, center, dimensions, is_rotated=False):
+        # dimensions为矩形在x、y方向上的尺寸，is_rotated时按90度记录角度，占据的区域不变
+        if is_rotated:
+            return Rectangle(center, dimensions[0], dimensions[1], 90, self.room.is_exact)
+        return Rectangle(center, dimensions[1], dimensions[0], exact=self.room.is_exact)
+    
+    def find_wall_positions(self, item_name, dimensions, is_rotated=False):
         # 查找沿墙的可能位置
         edges = self.get_wall_edges()
         positions = []
         
         for edge in edges:
+            self.check_cancelled()
             p1, p2 = edge
             
             # 确定边的方向
-            is_horizontal = abs(p1.y - p2.y) < 1e-6
+            is_horizontal = self.room.is_zero(p1.y - p2.y)
             
             if is_horizontal:
                 # 水平边
@@ -243,19 +525,19 @@ class RectanglePacker:
                 y = p1.y
                 
                 # 确定放置在边的上方还是下方
-                test_point = Point((start_x + end_x) / 2, y + 10)
-                if self.polygon.is_point_inside(test_point):
+                test_point = Point(self.room.half(start_x + end_x), y + 10 * self.room.unit)
+                if self.room.is_room_side(edge, test_point):
                     # 边在下方，矩形放在上方
-                    y += height / 2
+                    y += self.room.half(height)
                 else:
                     # 边在上方，矩形放在下方
-                    y -= height / 2
+                    y -= self.room.half(height)
                 
                 # 沿边滑动，寻找所有可能的位置
-                step = 10  # 步长
+                step = 10 * self.room.unit  # 步长
                 for x in range(int(start_x), int(end_x - dimensions[0]), step):
-                    center = Point(x + dimensions[0] / 2, y)
-                    rect = Rectangle(center, dimensions[1], dimensions[0])
+                    center = Point(x + self.room.half(dimensions[0]), y)
+                    rect = self.make_rectangle(center, dimensions, is_rotated)
                     if self.is_rectangle_valid(rect):
                         positions.append((rect, edge))
                         
@@ -273,92 +555,385 @@ class RectanglePacker:
                 x = p1.x
                 
                 # 确定放置在边的左侧还是右侧
-                test_point = Point(x + 10, (start_y + end_y) / 2)
-                if self.polygon.is_point_inside(test_point):
+                test_point = Point(x + 10 * self.room.unit, self.room.half(start_y + end_y))
+                if self.room.is_room_side(edge, test_point):
                     # 边在左侧，矩形放在右侧
-                    x += width / 2
+                    x += self.room.half(width)
                 else:
                     # 边在右侧，矩形放在左侧
-                    x -= width / 2
+                    x -= self.room.half(width)
                 
                 # 沿边滑动，寻找所有可能的位置
-                step = 10  # 步长
+                step = 10 * self.room.unit  # 步长
                 for y in range(int(start_y), int(end_y - dimensions[1]), step):
-                    center = Point(x, y + dimensions[1] / 2)
-                    rect = Rectangle(center, dimensions[1], dimensions[0])
+                    center = Point(x, y + self.room.half(dimensions[1]))
+                    rect = self.make_rectangle(center, dimensions, is_rotated)
                     if self.is_rectangle_valid(rect):
                         positions.append((rect, edge))
         
         return positions
     
+    def find_corner_positions(self, item_name, dimensions, is_rotated=False):
+        # 只在极点处生成沿墙的候选位置：房间的顶点、门阻碍区域的两端、已放置物品的角点
+        # 候选矩形的一端与极点对齐，并紧贴墙面
+        positions = []
+        
+        # 按x、y方向分别收集极点坐标，障碍物的顶点同样作为极点
+        xs = set(p.x for p in self.room.polygon.points)
+        ys = set(p.y for p in self.room.polygon.points)
+        for box, zone, kind in self.room.keep_out.zones:
+            xs.update(p.x for p in zone.points)
+            ys.update(p.y for p in zone.points)
+        for placed in self.placed_rectangles:
+            min_x, min_y, max_x, max_y = placed.get_bounds()
+            xs.update((min_x, max_x))
+            ys.update((min_y, max_y))
+        
+        for edge in self.get_wall_edges():
+            self.check_cancelled()
+            p1, p2 = edge
+            
+            # 确定边的方向，斜墙无法与矩形的边贴合
+            if self.room.is_zero(p1.y - p2.y):
+                is_horizontal = True
+                start, end = sorted((p1.x, p2.x))
+                wall = p1.y
+                along, depth = dimensions
+                anchors = xs
+            elif self.room.is_zero(p1.x - p2.x):
+                is_horizontal = False
+                start, end = sorted((p1.y, p2.y))
+                wall = p1.x
+                depth, along = dimensions
+                anchors = ys
+            else:
+                continue
+            
+            if end - start < along:
+                continue
+            
+            # 确定房间在墙的哪一侧，矩形紧贴墙面放在房间一侧
+            mid = self.room.half(start + end)
+            test_offset = 10 * self.room.unit
+            test_point = Point(mid, wall + test_offset) if is_horizontal else Point(wall + test_offset, mid)
+            if self.room.is_room_side(edge, test_point):
+                offset = wall + self.room.half(depth)
+            else:
+                offset = wall - self.room.half(depth)
+            
+            # 矩形的起点或终点与极点对齐
+            starts = set()
+            for t in anchors:
+                for lo in (t, t - along):
+                    if start <= lo and lo + along <= end:
+                        starts.add(lo)
+            
+            for lo in sorted(starts):
+                c = lo + self.room.half(along)
+                center = Point(c, offset) if is_horizontal else Point(offset, c)
+                rect = self.make_rectangle(center, dimensions, is_rotated)
+                # 候选矩形紧贴墙面，顶点落在墙上是允许的
+                if self.is_rectangle_valid(rect, include_edges=True):
+                    positions.append((rect, edge))
+        
+        return positions
+    
+    def find_internal_positions(self, item_name, dimensions, is_rotated=False):
+        # 查找内部的可能位置
+        positions = []
+        
+        # 获取多边形的边界框
+        min_x, min_y, max_x, max_y = self.room.bounds
+        
+        # 获取矩形尺寸
+        width, length = dimensions
+        
+        # 在内部生成网格点
+        step = 50 * self.room.unit  # 步长可以调整
+        for x in range(int(min_x + self.room.half(width)), int(max_x - self.room.half(width)), step):
+            self.check_cancelled()
+            for y in range(int(min_y + self.room.half(length)), int(max_y - self.room.half(length)), step):
+                center = Point(x, y)
+                rect = self.make_rectangle(center, dimensions, is_rotated)
+                
+                # 检查矩形是否有效
+                if self.is_rectangle_valid(rect):
+                    positions.append((rect, None))
+        
+        return positions
+    
+    def is_fridge_door_clear(self, fridge_rect):
+        # 检查冰箱开门边是否有其他物品
+        # 假设开门边是length方向（较长的一边）
+        width, length = fridge_rect.get_dimensions()
+        
+        # 确定开门边的方向
+        # 冰箱开门边通常是较长的一边，这里假设是length方向
+        center = fridge_rect.center
+        
+        # 计算开门边周围的区域
+        door_margin = 50 * self.room.unit  # 开门边需要的额外空间
+        
+        # 创建一个代表开门边影响区域的矩形
+        # 假设开门边在右侧
+        door_center = Point(center.x + self.room.half(length) + door_margin, center.y)
+        door_rect = Rectangle(door_center, length, door_margin * 2, exact=self.room.is_exact)
+        
+        # 检查是否与其他物品重叠
+        for placed in self.placed_rectangles:
+            if self.is_overlap(door_rect, placed):
+                return False
+        
+        return True
+    
+    def select_best_rotation(self, item_name, dimensions):
+        # 尝试两种旋转方向，选择可用位置更多的方向
+        original_dim = dimensions
+        rotated_dim = (dimensions[1], dimensions[0])
+        
+        # 计算两种旋转方向的可用沿墙位置数量
+        original_wall_positions = self.find_wall_positions(item_name, original_dim)
+        rotated_wall_positions = self.find_wall_positions(item_name, rotated_dim)
+        
+        # 优先选择沿墙位置更多的旋转方向
+        if len(original_wall_positions) >= len(rotated_wall_positions):
+            return original_dim, False
+        else:
+            return rotated_dim, True
+    
+    def place(self, item_name, rect, on_wall):
+        self.placed_rectangles.append(rect)
+        self.item_map[item_name] = rect
+        if on_wall:
+            self.wall_items.add(item_name)
+    
     def pack_rectangles(self):
+        place_item = PLACEMENT_STRATEGIES[self.strategy]
+        
         # 按照物品尺寸排序，先放置大的物品
         sorted_items = sorted(self.items.items(), key=lambda x: x[1][0] * x[1][1], reverse=True)
         
         for item_name, dimensions in sorted_items:
-            length, width = dimensions
-            
-            # 尝试两种旋转方向
-            for is_rotated in [False, True]:
-                if is_rotated:
-                    rect_length, rect_width = width, length
-                else:
-                    rect_length, rect_width = length, width
-                
-                # 寻找沿墙的位置
-                positions = self.find_wall_positions(item_name, (rect_width, rect_length))
-                
-                if positions:
-                    # 选择第一个可用的位置
-                    best_rect, edge = positions[0]
-                    self.placed_rectangles.append(best_rect)
-                    break
-            else:
-                # 如果没有找到沿墙的位置，尝试在内部放置
-                # 这里可以实现更复杂的内部放置算法
-                print(f"Warning: Could not place item {item_name} along walls")
+            # 跳过预先放置的物品
+            if item_name in self.item_map:
+                continue
+            if not place_item(self, item_name, dimensions):
+                self.log.warning("Could not place item %s", item_name)
         
         return len(self.placed_rectangles) == len(self.items)
     
     def get_result(self):
         result = {
             "feasible": len(self.placed_rectangles) == len(self.items),
-            "placements": []
+            "placements": [],
+            "unplaced": []
         }
         
-        for i, rect in enumerate(self.placed_rectangles):
-            placement = {
-                "center": (rect.center.x, rect.center.y),
-                "angle": rect.angle
-            }
-            result["placements"].append(placement)
+        # 按照物品名称顺序输出结果
+        for item_name in self.items.keys():
+            if item_name in self.item_map:
+                rect = self.item_map[item_name]
+                placement = {
+                    "name": item_name,
+                    "center": (self.room.to_output(rect.center.x), self.room.to_output(rect.center.y)),
+                    "angle": rect.angle,
+                    "onWall": item_name in self.wall_items
+                }
+                result["placements"].append(placement)
+            else:
+                result["unplaced"].append(item_name)
         
         return result
 
-def solve_packing(input_data):
-    boundary = input_data["boundary"]
-    door_points = input_data["door"]
-    is_open_inward = input_data.get("isOpenInward", False)
-    items = input_data["algoToPlace"]
+@register_strategy("wall")
+def place_along_wall(packer, item_name, dimensions):
+    # 只沿墙放置，依次尝试两种旋转方向
+    length, width = dimensions
+    
+    for is_rotated in [False, True]:
+        if is_rotated:
+            rect_length, rect_width = width, length
+        else:
+            rect_length, rect_width = length, width
+        
+        # 寻找沿墙的位置
+        positions = packer.find_wall_positions(item_name, (rect_width, rect_length))
+        
+        if positions:
+            # 选择第一个可用的位置
+            best_rect, edge = positions[0]
+            packer.place(item_name, best_rect, True)
+            return True
+    
+    return False
+
+@register_strategy("wall_then_interior")
+def place_along_wall_then_interior(packer, item_name, dimensions):
+    # 选择沿墙位置更多的旋转方向，沿墙失败时退回内部放置
+    best_dim, is_rotated = packer.select_best_rotation(item_name, dimensions)
+    
+    # 寻找沿墙位置，旋转后的矩形在检查前就已确定，检查的就是最终占据的区域
+    wall_positions = packer.find_wall_positions(item_name, best_dim, is_rotated)
+    
+    if wall_positions:
+        # 选择第一个可用的沿墙位置
+        best_rect, edge = wall_positions[0]
+        
+        # 如果是冰箱，检查开门边
+        if item_name == "fridge" and not packer.is_fridge_door_clear(best_rect):
+            packer.log.warning("Could not place fridge %s due to door clearance", item_name)
+        else:
+            packer.place(item_name, best_rect, True)
+            packer.log.info("Placed item %s along wall", item_name)
+            return True
+    
+    # 如果沿墙放置失败，尝试内部放置
+    for internal_rotation in [False, True]:
+        if internal_rotation:
+            internal_dim = (dimensions[1], dimensions[0])
+        else:
+            internal_dim = dimensions
+        
+        # 寻找内部位置
+        internal_positions = packer.find_internal_positions(item_name, internal_dim, internal_rotation)
+        
+        if internal_positions:
+            # 选择第一个可用的内部位置
+            best_rect, edge = internal_positions[0]
+            
+            # 如果是冰箱，检查开门边
+            if item_name == "fridge" and not packer.is_fridge_door_clear(best_rect):
+                packer.log.warning("Could not place fridge %s in internal position due to door clearance", item_name)
+                continue
+            
+            packer.place(item_name, best_rect, False)
+            packer.log.info("Placed item %s in internal position", item_name)
+            return True
+    
+    return False
+
+@register_strategy("corner_points")
+def place_at_corner_points(packer, item_name, dimensions):
+    # 只在极点处沿墙放置，依次尝试两种旋转方向
+    for is_rotated in [False, True]:
+        if is_rotated:
+            rect_dim = (dimensions[1], dimensions[0])
+        else:
+            rect_dim = dimensions
+        
+        positions = packer.find_corner_positions(item_name, rect_dim, is_rotated)
+        
+        if positions:
+            # 选择第一个可用的位置
+            best_rect, edge = positions[0]
+            packer.place(item_name, best_rect, True)
+            return True
+    
+    return False
+
+def solve_packing(input_data, strategy=DEFAULT_STRATEGY, cancel_event=None, room=None, log=None, precision=None):
+    # room为预先编译的房间几何，多次求解同一房间时可以共享
+    # precision不为None时以定点模式编译房间；传入room时使用room自身的模式
+    if room is None:
+        room = compile_room(input_data, precision)
+    items = scale_items(input_data["algoToPlace"], room.scale)
     
     # 创建packer实例
-    packer = RectanglePacker(boundary, door_points, items)
-    packer.set_door_open_inward(is_open_inward)
+    packer = RectanglePacker(room, items, strategy, cancel_event, log)
     feasible = packer.pack_rectangles()
     
     return packer.get_result()
 
-if __name__ == "__main__":
+def solve_many(room, item_sets, strategy=DEFAULT_STRATEGY, max_workers=None, log=None):
+    # 在线程池中对同一个已编译房间并发求解多组物品，结果顺序与item_sets一致
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(solve_packing, {"algoToPlace": items}, strategy, room=room, log=log)
+            for items in item_sets
+        ]
+        return [future.result() for future in futures]
+
+def is_all_on_wall(result):
+    return result["feasible"] and all(p["onWall"] for p in result["placements"])
+
+def race_strategies(input_data, strategies=None, precision=None):
+    # 在多个进程中并发运行放置策略，返回第一个全部贴墙的可行解并取消其余策略
+    # 策略是纯Python的计算，用进程而不是线程才能真正并行
+    # 若没有策略得到全部贴墙的解，则按注册顺序返回放置物品最多的结果
+    if strategies is None:
+        strategies = list(PLACEMENT_STRATEGIES)
+    
+    room = compile_room(input_data, precision)
+    results = {}
+    
+    with multiprocessing.Manager() as manager:
+        cancel_event = manager.Event()
+        executor = ProcessPoolExecutor(max_workers=len(strategies))
+        try:
+            futures = {
+                executor.submit(solve_packing, input_data, name, cancel_event, room): name
+                for name in strategies
+            }
+            
+            for future in as_completed(futures):
+                try:
+                    result = future.result()
+                except SolveCancelled:
+                    continue
+                
+                results[futures[future]] = result
+                if is_all_on_wall(result):
+                    # 通知正在运行的策略退出，尚未开始的直接取消
+                    cancel_event.set()
+                    executor.shutdown(wait=False, cancel_futures=True)
+                    result["strategy"] = futures[future]
+                    return result
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+    
+    name = max(strategies, key=lambda n: (results[n]["feasible"], len(results[n]["placements"])))
+    result = results[name]
+    result["strategy"] = name
+    return result
+
+def main(argv=None, default_strategy=DEFAULT_STRATEGY):
     # 测试示例
+    # 可选参数：批量结果输出路径（.npy列式二进制格式）及放置策略，例如
+    #   python rectangle_packer.py results.npy --strategy race
+    import argparse
     import os
     
+    parser = argparse.ArgumentParser()
+    parser.add_argument("output", nargs="?")
+    parser.add_argument("--strategy", default=default_strategy,
+                        choices=list(PLACEMENT_STRATEGIES) + ["race"])
+    parser.add_argument("--precision", type=int, default=None,
+                        help="启用整数定点模式，坐标保留的小数位数")
+    args = parser.parse_args(argv)
+    
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s: %(message)s")
+    
+    results = {}
     for i in range(1, 5):
         input_file = f"example{i}.json"
         if os.path.exists(input_file):
             with open(input_file, "r") as f:
                 input_data = json.load(f)
                 
-            result = solve_packing(input_data)
+            print(f"\nProcessing Example {i}...")
+            if args.strategy == "race":
+                result = race_strategies(input_data, precision=args.precision)
+            else:
+                result = solve_packing(input_data, args.strategy, precision=args.precision)
+            results[f"example{i}"] = result
             print(f"Example {i} result:")
             print(json.dumps(result, indent=2))
-            print()
\ No newline at end of file
+            print()
+    
+    if args.output:
+        from columnar_io import write_results
+        count = write_results(args.output, results)
+        print(f"Wrote {count} rows to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+import json
+
+from columnar_io import read_results, write_results
+
+
+def normalize(results):
+    # 与JSON文件比较：元组在JSON中是列表
+    return json.loads(json.dumps(results))
+
+
+def test_room_results_round_trip(tmp_path):
+    results = {
+        "A": {
+            "feasible": False,
+            "placements": [
+                {"name": "fridge", "center": (610.0, 665.0), "angle": 0, "onWall": True},
+                {"name": "shelf-1", "center": (1500.5, 200.0), "angle": 90, "onWall": False}
+            ],
+            "unplaced": ["shelf-2"]
+        },
+        "B": {"feasible": True, "placements": [], "unplaced": []}
+    }
+
+    path = tmp_path / "results.npy"
+    write_results(path, results)
+
+    assert normalize(read_results(path)) == normalize(results)
+
+
+def test_floor_plan_round_trip_keeps_empty_rooms_and_unplaced_items(tmp_path):
+    results = {
+        "feasible": False,
+        "rooms": {
+            "A": {"feasible": True, "placements": [], "unplaced": []},
+            "B": {
+                "feasible": True,
+                "placements": [{"name": "fridge", "center": (610.0, 665.0), "angle": 0, "onWall": True}],
+                "unplaced": []
+            },
+            "C": {"feasible": True, "placements": [], "unplaced": []}
+        },
+        "unplaced": ["huge"]
+    }
+
+    path = tmp_path / "plan.npy"
+    write_results(path, results)
+
+    assert normalize(read_results(path)) == normalize(results)
+
+
+def test_floor_plan_without_unplaced_items_round_trips(tmp_path):
+    results = {
+        "feasible": True,
+        "rooms": {"A": {"feasible": True, "placements": [], "unplaced": []}},
+        "unplaced": []
+    }
+
+    path = tmp_path / "plan.npy"
+    write_results(path, results)
+
+    assert normalize(read_results(path)) == normalize(results)
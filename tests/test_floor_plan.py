@@ -0,0 +1,63 @@
+import pytest
+
+from floor_plan import can_fit, solve_floor_plan
+from rectangle_packer import compile_room
+
+
+def test_can_fit_compares_sides_not_diagonal():
+    room = compile_room({"boundary": [[0, 0], [1000, 0], [1000, 100], [0, 100]]})
+
+    assert can_fit(room, (900, 100))
+    assert can_fit(room, (100, 900))
+    assert not can_fit(room, (900, 900))
+
+
+def test_solve_floor_plan_reassigns_and_reports_unplaced():
+    input_data = {
+        "rooms": [
+            {"id": "A", "boundary": [[0, 0], [1000, 0], [1000, 1000], [0, 1000]]},
+            {"id": "B", "boundary": [[0, 0], [3000, 0], [3000, 3000], [0, 3000]]}
+        ],
+        "algoToPlace": {
+            "big": [2000, 400],
+            "shelf": [600, 400],
+            "huge": [5000, 5000]
+        }
+    }
+
+    result = solve_floor_plan(input_data, max_workers=2)
+
+    assert not result["feasible"]
+    assert result["unplaced"] == ["huge"]
+    placed = {
+        placement["name"]: room_id
+        for room_id, room_result in result["rooms"].items()
+        for placement in room_result["placements"]
+    }
+    assert placed["big"] == "B"
+    assert set(placed) == {"big", "shelf"}
+
+
+def test_duplicate_room_ids_are_rejected():
+    boundary = [[0, 0], [1000, 0], [1000, 1000], [0, 1000]]
+    items = {"shelf": [600, 400]}
+
+    with pytest.raises(ValueError, match="Duplicate room id: A"):
+        solve_floor_plan({"rooms": [{"id": "A", "boundary": boundary}, {"id": "A", "boundary": boundary}],
+                          "algoToPlace": items})
+    # 没有id的第二个房间的id为"1"
+    with pytest.raises(ValueError, match="Duplicate room id: 1"):
+        solve_floor_plan({"rooms": [{"id": "1", "boundary": boundary}, {"boundary": boundary}],
+                          "algoToPlace": items})
+
+
+def test_item_with_zero_side_is_unplaced():
+    input_data = {
+        "rooms": [{"id": "A", "boundary": [[0, 0], [1000, 0], [1000, 1000], [0, 1000]]}],
+        "algoToPlace": {"shelf": [600, 400], "flat": [600, 0]}
+    }
+
+    result = solve_floor_plan(input_data, max_workers=1)
+
+    assert result["unplaced"] == ["flat"]
+    assert [p["name"] for p in result["rooms"]["A"]["placements"]] == ["shelf"]
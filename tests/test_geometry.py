@@ -0,0 +1,219 @@
+import math
+from fractions import Fraction
+
+from rectangle_packer import (Door, KeepOutIndex, Point, Polygon, Rectangle, RectanglePacker, compile_room,
+                              get_scale, scale_input)
+
+
+def test_keep_out_overlaps_zone_inside_candidate():
+    index = KeepOutIndex()
+    index.add([Point(40, 40), Point(60, 40), Point(60, 60), Point(40, 60)])
+
+    # 区域的顶点都不是候选矩形的顶点，但区域完全在矩形内部
+    assert index.overlaps((0, 0, 100, 100))
+
+
+def test_keep_out_flush_edge_is_not_overlap():
+    index = KeepOutIndex()
+    index.add([Point(100, 0), Point(200, 0), Point(200, 100), Point(100, 100)])
+
+    assert not index.overlaps((0, 0, 100, 100))
+    assert index.overlaps((0, 0, 101, 100))
+
+
+def test_keep_out_zone_spanning_several_cells():
+    index = KeepOutIndex(cell_size=100)
+    index.add([Point(0, 0), Point(1000, 0), Point(1000, 1000), Point(0, 1000)])
+
+    # 候选矩形只落在区域覆盖的远处网格中
+    assert index.overlaps((850, 850, 900, 900))
+    assert not index.overlaps((1000, 0, 1100, 100))
+
+
+def test_keep_out_slanted_zone_uses_exact_shape():
+    index = KeepOutIndex()
+    index.add([Point(0, 50), Point(50, 0), Point(100, 50), Point(50, 100)])
+
+    # 候选矩形在区域包围盒内，但在菱形之外
+    assert not index.overlaps((0, 0, 20, 20))
+    assert index.overlaps((40, 40, 60, 60))
+
+
+def test_zero_length_door_has_no_obstruction():
+    polygon = Polygon([[0, 0], [1000, 0], [1000, 1000], [0, 1000]])
+    door = Door([[0, 500], [0, 500]], True)
+
+    assert door.get_obstruction_area(polygon) == []
+
+
+def test_door_on_45_degree_wall():
+    # 直角三角形，斜边为45度的墙，门在斜边上内开
+    input_data = {
+        "boundary": [[0, 0], [2000, 0], [0, 2000]],
+        "doors": [{"points": [[1200, 800], [800, 1200]], "isOpenInward": True}],
+        "algoToPlace": {}
+    }
+    room = compile_room(input_data)
+    (box, zone, kind), = room.keep_out.zones
+
+    # 阻碍区域是以门宽为边长、贴着斜墙的正方形，位于房间内侧
+    width = math.hypot(400, 400)
+    assert math.isclose(zone.get_area(), width * width)
+    center = Point(sum(p.x for p in zone.points) / 4, sum(p.y for p in zone.points) / 4)
+    assert room.polygon.is_point_inside(center)
+    assert math.isclose(center.x, 800) and math.isclose(center.y, 800)
+
+    # 正方形中心附近的物品被阻碍，远离门的角落不受影响
+    assert room.keep_out.overlaps(Rectangle(Point(800, 800), 100, 100).get_bounds())
+    assert not room.keep_out.overlaps(Rectangle(Point(200, 200), 100, 100).get_bounds())
+
+
+def test_obstacle_touching_wall_midpoint_keeps_wall_usable():
+    # 障碍物贴在底墙中点上，底墙的测试点落在障碍物内时也要判断出房间一侧
+    input_data = {
+        "boundary": [[0, 0], [1000, 0], [1000, 1000], [0, 1000]],
+        "obstacles": [[[450, 0], [550, 0], [550, 100], [450, 100]]],
+        "algoToPlace": {}
+    }
+    room = compile_room(input_data)
+    packer = RectanglePacker(room, {})
+
+    def on_bottom_wall(positions):
+        return [rect for rect, (p1, p2) in positions if p1.y == 0 and p2.y == 0]
+
+    wall_positions = on_bottom_wall(packer.find_wall_positions("shelf", (300, 200)))
+    corner_positions = on_bottom_wall(packer.find_corner_positions("shelf", (300, 200)))
+
+    assert wall_positions and corner_positions
+    for rect in wall_positions + corner_positions:
+        min_x, min_y, max_x, max_y = rect.get_bounds()
+        assert (min_y, max_y) == (0, 200)
+        assert max_x <= 450 or min_x >= 550
+
+
+def assert_obstacle_positions_valid(room, positions):
+    # 候选位置贴着障碍物的面，且不与任何障碍物或其他区域重叠
+    obstacle_positions = [(rect, edge) for rect, edge in positions if edge in room.edge_obstacles]
+    assert obstacle_positions
+    for rect, edge in obstacle_positions:
+        assert not room.keep_out.overlaps(rect.get_bounds())
+        assert all(room.polygon.is_point_inside(v) for v in rect.vertices)
+    return obstacle_positions
+
+
+def test_flush_obstacles_are_usable_as_walls():
+    # 两个障碍物共用x=1500的一条边，拼成一个整体
+    input_data = {
+        "boundary": [[0, 0], [3000, 0], [3000, 2500], [0, 2500]],
+        "obstacles": [
+            [[1000, 1000], [1500, 1000], [1500, 1500], [1000, 1500]],
+            [[1500, 1000], [2000, 1000], [2000, 1500], [1500, 1500]]
+        ],
+        "algoToPlace": {f"shelf-{i}": [900, 400] for i in range(1, 13)}
+    }
+    room = compile_room(input_data)
+    empty = RectanglePacker(room, {})
+
+    for positions in (empty.find_wall_positions("shelf", (400, 900)),
+                      empty.find_corner_positions("shelf", (400, 900))):
+        obstacle_positions = assert_obstacle_positions_valid(room, positions)
+        # 共用的边两侧都是障碍物，不能贴着它放置
+        assert not [edge for rect, edge in obstacle_positions if edge[0].x == edge[1].x == 1500]
+
+    for strategy in ("wall", "corner_points"):
+        packer = RectanglePacker(room, input_data["algoToPlace"], strategy)
+        packer.pack_rectangles()
+        for item_name, rect in packer.item_map.items():
+            assert not room.keep_out.overlaps(rect.get_bounds()), (strategy, item_name)
+
+    # 轮廓的墙放满后，wall策略把物品贴在障碍物的外侧面上
+    packer = RectanglePacker(room, input_data["algoToPlace"], "wall")
+    packer.pack_rectangles()
+    faces = [rect.get_bounds() for rect in packer.item_map.values()]
+    assert (1000, 1500, 1400, 2400) in faces
+    assert (2000, 1000, 2900, 1400) in faces
+
+
+def test_obstacle_spanning_several_cells():
+    # 障碍物横跨x方向的4个网格（网格边长1000）
+    input_data = {
+        "boundary": [[0, 0], [4000, 0], [4000, 3000], [0, 3000]],
+        "obstacles": [[[500, 1200], [3500, 1200], [3500, 1500], [500, 1500]]],
+        "algoToPlace": {}
+    }
+    room = compile_room(input_data)
+
+    assert len([cell for cell, ids in room.keep_out.cells.items() if 0 in ids]) == 4
+    # 只与中间网格相交的候选矩形也能查到障碍物
+    assert room.keep_out.overlaps((2200, 1100, 2300, 1300))
+    assert not room.keep_out.overlaps((2200, 1000, 2300, 1200))
+
+    empty = RectanglePacker(room, {})
+    for positions in (empty.find_wall_positions("shelf", (900, 400)),
+                      empty.find_corner_positions("shelf", (900, 400))):
+        # 障碍物的上下两个长面都可以贴墙
+        boxes = [rect.get_bounds() for rect, edge in assert_obstacle_positions_valid(room, positions)]
+        assert any(box[3] == 1200 for box in boxes)
+        assert any(box[1] == 1500 for box in boxes)
+
+    # 沿墙滑动时，跨过网格边界的位置同样有效
+    boxes = [rect.get_bounds() for rect, edge in empty.find_wall_positions("shelf", (900, 400))]
+    assert (1550, 800, 2450, 1200) in boxes
+
+
+def test_float_mode_halves_with_division():
+    # 浮点模式下奇数尺寸折半得到浮点数，只有定点模式才用分数保持精确
+    vertices = Rectangle(Point(0, 0), 3, 5).vertices
+    assert [(v.x, v.y) for v in vertices] == [(-2.5, -1.5), (2.5, -1.5), (2.5, 1.5), (-2.5, 1.5)]
+    assert all(isinstance(v.x, float) and isinstance(v.y, float) for v in vertices)
+
+    exact = Rectangle(Point(0, 0), 3, 5, exact=True).vertices
+    assert (exact[0].x, exact[0].y) == (Fraction(-5, 2), Fraction(-3, 2))
+
+    input_data = {
+        "boundary": [[0, 0], [1001, 0], [1001, 1001], [0, 1001]],
+        "doors": [{"points": [[0, 301], [0, 601]], "isOpenInward": True}],
+        "algoToPlace": {"shelf-1": [301, 201], "shelf-2": [501, 101]}
+    }
+    room = compile_room(input_data)
+    assert not room.polygon.is_exact
+    for strategy in ("wall", "wall_then_interior", "corner_points"):
+        packer = RectanglePacker(room, input_data["algoToPlace"], strategy)
+        packer.pack_rectangles()
+        assert packer.item_map
+        for rect in packer.item_map.values():
+            assert not any(isinstance(value, Fraction) for v in rect.vertices for value in (v.x, v.y))
+
+
+def test_fixed_point_values_are_even_ints():
+    # 1.23456 * 20000 = 24691.2，直接取整会得到奇数
+    input_data = {
+        "boundary": [[0, 0], [1.23456, 0], [1.23456, 1.00007], [0, 1.00007]],
+        "doors": [{"points": [[0.10003, 0], [0.50001, 0]], "isOpenInward": True}],
+        "obstacles": [[[0.60005, 0.2], [0.9, 0.2], [0.9, 0.40003]]],
+        "algoToPlace": {"shelf": [0.30001, 0.12345]}
+    }
+    data = scale_input(input_data, get_scale(4))
+
+    values = [v for point in data["boundary"] for v in point]
+    values += [v for door in data["doors"] for point in door["points"] for v in point]
+    values += [v for points in data["obstacles"] for point in points for v in point]
+    values += [v for dimensions in data["algoToPlace"].values() for v in dimensions]
+    for value in values:
+        assert isinstance(value, int) and value % 2 == 0
+    assert data["boundary"][1][0] == 24692
+
+
+def test_fixed_point_slanted_door_zone_is_exact():
+    # 定点模式下斜墙上的门（门宽是无理数），阻碍区域的顶点仍是整数且是精确的正方形
+    input_data = {
+        "boundary": [[0, 0], [2000, 0], [0, 2000]],
+        "doors": [{"points": [[1200, 800], [900, 1100]], "isOpenInward": True}],
+        "algoToPlace": {}
+    }
+    room = compile_room(input_data, precision=0)
+    (box, zone, kind), = room.keep_out.zones
+
+    assert all(isinstance(p.x, int) and isinstance(p.y, int) for p in zone.points)
+    assert [(p.x, p.y) for p in zone.points] == [(2400, 1600), (1800, 2200), (1200, 1600), (1800, 1000)]
+    assert zone.get_area() == 600 * 600 * 2
@@ -0,0 +1,179 @@
+import json
+import logging
+import os
+
+import pytest
+
+import rectangle_packer
+import rectangle_packer_v2
+from rectangle_packer import (RectanglePacker, compile_room, get_scale, race_strategies, scale_items, segment_enters_box,
+                              solve_many, solve_packing)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def load_example(i):
+    with open(os.path.join(ROOT, f"example{i}.json"), "r") as f:
+        return json.load(f)
+
+
+def assert_layout_inside_room(room, packer):
+    boundary_edges = [
+        (room.polygon.points[i], room.polygon.points[(i + 1) % len(room.polygon.points)])
+        for i in range(len(room.polygon.points))
+    ]
+    for item_name, rect in packer.item_map.items():
+        box = rect.get_bounds()
+        assert all(room.polygon.contains_point(v) for v in rect.vertices), item_name
+        assert not any(segment_enters_box(p1, p2, box, room.is_exact) for p1, p2 in boundary_edges), item_name
+        assert not room.keep_out.overlaps(box), item_name
+        for other_name, other in packer.item_map.items():
+            if other_name != item_name:
+                assert not packer.is_overlap(rect, other), (item_name, other_name)
+
+
+def test_corner_points_does_not_cross_internal_wall():
+    # example4的轮廓有一段凹进来的墙（x 184373–184473, y 29642–30642），
+    # 四个顶点都在轮廓上的矩形仍可能被这段墙穿过
+    input_data = load_example(4)
+    room = compile_room(input_data)
+    packer = RectanglePacker(room, input_data["algoToPlace"], "corner_points")
+    packer.pack_rectangles()
+
+    assert_layout_inside_room(room, packer)
+
+
+def test_default_strategy_is_wall():
+    input_data = load_example(1)
+
+    assert solve_packing(input_data) == solve_packing(input_data, "wall")
+
+
+def test_v2_entry_point_defaults_to_wall_then_interior():
+    input_data = load_example(1)
+
+    assert rectangle_packer_v2.solve_packing(input_data) == solve_packing(input_data, "wall_then_interior")
+
+
+def assert_race_winner_valid(input_data, result):
+    # 获胜策略取决于哪个进程先完成，用获胜策略重新求解并检查其布局
+    room = compile_room(input_data)
+    packer = RectanglePacker(room, input_data["algoToPlace"], result["strategy"])
+    packer.pack_rectangles()
+    assert_layout_inside_room(room, packer)
+    assert result["placements"] == packer.get_result()["placements"]
+
+
+@pytest.mark.parametrize("strategy", list(rectangle_packer.PLACEMENT_STRATEGIES))
+@pytest.mark.parametrize("example", [1, 2, 3, 4])
+def test_strategy_layout_is_valid(strategy, example):
+    # 竞速可能返回任一策略的结果，每个策略的布局都必须在房间内且互不重叠
+    input_data = load_example(example)
+    room = compile_room(input_data)
+    packer = RectanglePacker(room, input_data["algoToPlace"], strategy)
+    packer.pack_rectangles()
+
+    assert_layout_inside_room(room, packer)
+
+
+def test_wall_then_interior_checks_rotated_footprint():
+    # 旋转后的矩形必须是检查过的那个，example1中旋转放置的物品曾与冰箱重叠或超出轮廓
+    input_data = load_example(1)
+    room = compile_room(input_data)
+    packer = RectanglePacker(room, input_data["algoToPlace"], "wall_then_interior")
+    packer.pack_rectangles()
+
+    assert any(rect.is_rotated for rect in packer.item_map.values())
+    assert_layout_inside_room(room, packer)
+
+
+@pytest.mark.parametrize("example", [1, 2, 3, 4])
+def test_race_winner_is_valid(example):
+    input_data = load_example(example)
+    result = race_strategies(input_data)
+
+    assert_race_winner_valid(input_data, result)
+
+
+def test_race_returns_all_on_wall_layout():
+    input_data = load_example(3)
+    result = race_strategies(input_data, ["wall", "wall_then_interior"])
+
+    assert result["feasible"]
+    assert all(p["onWall"] for p in result["placements"])
+    assert_race_winner_valid(input_data, result)
+
+
+def snapshot_room(room):
+    # 房间几何中所有可变容器的内容，用于确认求解前后没有被修改
+    return (
+        [(p.x, p.y) for p in room.polygon.points],
+        [(p1.x, p1.y, p2.x, p2.y) for p1, p2 in room.wall_edges],
+        [(box, [(p.x, p.y) for p in zone.points], kind) for box, zone, kind in room.keep_out.zones],
+        {cell: list(ids) for cell, ids in room.keep_out.cells.items()},
+        {cell: list(ids) for cell, ids in room.boundary_index.cells.items()},
+        room.bounds,
+    )
+
+
+def test_solve_many_matches_serial_results_on_shared_room():
+    input_data = load_example(3)
+    items = list(input_data["algoToPlace"].items())
+    item_sets = [dict(items[:k]) for k in range(1, len(items) + 1, 2)] * 2
+    room = compile_room(input_data)
+    before = snapshot_room(room)
+
+    results = solve_many(room, item_sets, "corner_points", max_workers=4)
+
+    assert results == [solve_packing({"algoToPlace": items}, "corner_points", room=room) for items in item_sets]
+    assert snapshot_room(room) == before
+
+
+def test_custom_log_receives_messages_and_nothing_goes_to_stdout(capsys, caplog):
+    input_data = load_example(1)
+    room = compile_room(input_data)
+
+    records = []
+    log = logging.getLogger("test_rectangle_packer.custom")
+    log.propagate = False
+    log.setLevel(logging.INFO)
+    handler = logging.Handler()
+    handler.emit = records.append
+    log.addHandler(handler)
+    try:
+        with caplog.at_level(logging.INFO):
+            solve_packing(input_data, "wall", room=room, log=log)
+            solve_many(room, [input_data["algoToPlace"]], "wall_then_interior", log=log)
+    finally:
+        log.removeHandler(handler)
+
+    messages = [record.getMessage() for record in records]
+    assert "Could not place item shelf-3" in messages
+    assert "Placed item fridge along wall" in messages
+    assert not [record for record in caplog.records if record.name == "rectangle_packer"]
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.parametrize("precision", [2, 4])
+@pytest.mark.parametrize("example", [1, 2, 3, 4])
+def test_fixed_point_solve_end_to_end(example, precision):
+    input_data = load_example(example)
+    scale = get_scale(precision)
+
+    for strategy in rectangle_packer.PLACEMENT_STRATEGIES:
+        room = compile_room(input_data, precision)
+        packer = RectanglePacker(room, scale_items(input_data["algoToPlace"], scale), strategy)
+        packer.pack_rectangles()
+
+        # 求解过程中的几何始终是整数，布局有效
+        for rect in packer.item_map.values():
+            assert all(type(value) is int for v in rect.vertices for value in (v.x, v.y))
+        assert_layout_inside_room(room, packer)
+
+    # corner_points的位置紧贴墙面并与极点对齐，与浮点模式的位置相差不超过1/scale
+    fixed = solve_packing(input_data, "corner_points", precision=precision)
+    flush = solve_packing(input_data, "corner_points")
+    assert [p["name"] for p in fixed["placements"]] == [p["name"] for p in flush["placements"]]
+    for a, b in zip(fixed["placements"], flush["placements"]):
+        assert abs(a["center"][0] - b["center"][0]) <= 1 / scale
+        assert abs(a["center"][1] - b["center"][1]) <= 1 / scale